@@ -224,6 +224,7 @@ VALID_OPTS = {
     'syndic_wait': int,
     'jinja_lstrip_blocks': bool,
     'jinja_trim_blocks': bool,
+    'jinja_bytecode_cache': bool,
     'minion_id_caching': bool,
     'sign_pub_messages': bool,
     'keysize': int,
@@ -279,6 +280,7 @@ DEFAULT_MINION_OPTS = {
     'sock_dir': os.path.join(salt.syspaths.SOCK_DIR, 'minion'),
     'backup_mode': '',
     'renderer': 'yaml_jinja',
+    'jinja_bytecode_cache': False,
     'failhard': False,
     'autoload_dynamic_modules': True,
     'environment': None,
@@ -510,6 +512,7 @@ DEFAULT_MASTER_OPTS = {
     'syndic_wait': 5,
     'jinja_lstrip_blocks': False,
     'jinja_trim_blocks': False,
+    'jinja_bytecode_cache': False,
     'sign_pub_messages': False,
     'keysize': 4096,
     'transport': 'zeromq',
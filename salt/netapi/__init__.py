@@ -3,6 +3,8 @@
 Make api awesomeness
 '''
 # Import Python libs
+import collections
+import copy
 import inspect
 import os
 
@@ -26,9 +28,42 @@ class NetapiClient(object):
     >>> lowstate = {'client': 'local', 'tgt': '*', 'fun': 'test.ping', 'arg': ''}
     >>> client.run(lowstate)
     '''
+    # Salt clients shared by the chunks of a batch, see run_batch
+    _batch_clients = None
+
     def __init__(self, opts):
         self.opts = opts
 
+    def _local_client(self):
+        '''
+        Return a LocalClient, reusing the one of the current batch if any
+        '''
+        if self._batch_clients is None:
+            return salt.client.get_local_client(mopts=self.opts)
+        if 'local' not in self._batch_clients:
+            self._batch_clients['local'] = salt.client.get_local_client(
+                    mopts=self.opts)
+        return self._batch_clients['local']
+
+    def run_batch(self, lows):
+        '''
+        Execute a list of lowstate chunks one after the other and yield their
+        results in the same order. The chunks share a single LocalClient
+        instead of setting one up for every chunk.
+
+        A result that is an iterator is drained before the next chunk runs,
+        it is yielded as an iterator over the drained items.
+        '''
+        # Work on a copy so concurrent callers of this instance do not share
+        # the batch clients
+        batch = copy.copy(self)
+        batch._batch_clients = {}
+        for low in lows:
+            ret = batch.run(low)
+            if isinstance(ret, collections.Iterator):
+                ret = iter(list(ret))
+            yield ret
+
     def run(self, low):
         '''
         Execute the specified function in the specified client by passing the
@@ -37,6 +72,10 @@ class NetapiClient(object):
         if 'client' not in low:
             raise SaltException('No client specified')
 
+        if low['client'] not in CLIENTS:
+            raise SaltException(
+                    'Unknown client {0!r}'.format(low['client']))
+
         if not ('token' in low or 'eauth' in low):
             raise EauthAuthenticationError(
                     'No authentication credentials given')
@@ -55,7 +94,7 @@ class NetapiClient(object):
 
         :return: job ID
         '''
-        local = salt.client.get_local_client(mopts=self.opts)
+        local = self._local_client()
         return local.run_job(*args, **kwargs)
 
     def local(self, *args, **kwargs):
@@ -66,7 +105,7 @@ class NetapiClient(object):
 
         :return: Returns the result from the execution module
         '''
-        local = salt.client.get_local_client(mopts=self.opts)
+        local = self._local_client()
         return local.cmd(*args, **kwargs)
 
     def local_batch(self, *args, **kwargs):
@@ -80,6 +119,8 @@ class NetapiClient(object):
         :return: Returns the result from the exeuction module for each batch of
             returns
         '''
+        # cmd_batch hands the job to salt.cli.batch.Batch, which sets up its
+        # own LocalClient, so there is nothing to share here
         local = salt.client.get_local_client(mopts=self.opts)
         return local.cmd_batch(*args, **kwargs)
 
@@ -130,3 +171,11 @@ class NetapiClient(object):
         kwargs['fun'] = fun
         wheel = salt.wheel.WheelClient(self.opts)
         return wheel.cmd_async(kwargs)
+
+
+# The client interfaces a lowstate chunk can select, the remaining methods
+# are the run entry points and their helpers
+CLIENTS = tuple(
+    name for name, _ in inspect.getmembers(
+        NetapiClient, predicate=inspect.isroutine)
+    if not name.startswith('_') and name not in ('run', 'run_batch'))
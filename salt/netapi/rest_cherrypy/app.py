@@ -199,6 +199,12 @@ import cherrypy
 from cherrypy.lib import cpstats
 import yaml
 
+# Serializing the response is pure CPU work that grows with the size of the
+# return data, use the libyaml bindings when they are available. The stdlib
+# json module already has a C encoder.
+YamlLoader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+YamlDumper = getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
+
 # Import Salt libs
 import salt
 import salt.auth
@@ -265,7 +271,7 @@ def salt_auth_tool():
     Redirect all unauthenticated requests to the login page
     '''
     # Redirect to the login page if the session hasn't been authed
-    if not cherrypy.session.has_key('token'):  # pylint: disable=W8601
+    if 'token' not in cherrypy.session:
         raise cherrypy.HTTPError(401)
 
     # Session is authenticated; inform caches
@@ -321,8 +327,19 @@ def cors_tool():
 ct_out_map = (
     ('application/json', json.dumps),
     ('application/x-yaml', functools.partial(
-        yaml.safe_dump, default_flow_style=False)),
+        yaml.dump, Dumper=YamlDumper, default_flow_style=False)),
 )
+ct_out_processors = dict(ct_out_map)
+ct_out_types = tuple(i for (i, _) in ct_out_map)
+
+# The error returned for unexpected exceptions outside of debug mode never
+# changes, so it is serialized once for each output format
+unexpected_error = {
+    'status': 500,
+    'return': 'An unexpected error occurred',
+}
+unexpected_error_out = dict(
+    (ct, out(unexpected_error)) for (ct, out) in ct_out_map)
 
 
 def hypermedia_handler(*args, **kwargs):
@@ -338,7 +355,7 @@ def hypermedia_handler(*args, **kwargs):
     # to handle (auth & HTTP errors). Reformat any errors we don't know how to
     # handle as a data structure.
     try:
-        cherrypy.response.processors = dict(ct_out_map)
+        cherrypy.response.processors = ct_out_processors
         ret = cherrypy.serving.request._hypermedia_inner_handler(*args, **kwargs)
     except salt.exceptions.EauthAuthenticationError:
         raise cherrypy.HTTPError(401)
@@ -353,17 +370,26 @@ def hypermedia_handler(*args, **kwargs):
 
         cherrypy.response.status = 500
 
-        ret = {
-            'status': cherrypy.response.status,
-            'return': '{0}'.format(traceback.format_exc(exc))
-                    if cherrypy.config['debug']
-                    else "An unexpected error occurred"}
+        if cherrypy.config['debug']:
+            ret = {
+                'status': cherrypy.response.status,
+                'return': '{0}'.format(traceback.format_exc(exc))}
+        else:
+            ret = unexpected_error
 
-    # Raises 406 if requested content-type is not supported
-    best = cherrypy.lib.cptools.accept([i for (i, _) in ct_out_map])
+    # A lone supported media type (e.g. Accept: application/json) is by far the
+    # most common Accept header, take it as-is instead of parsing the header
+    accept = cherrypy.request.headers.get('Accept')
+    if accept in ct_out_processors:
+        best = accept
+    else:
+        # Raises 406 if requested content-type is not supported
+        best = cherrypy.lib.cptools.accept(ct_out_types)
 
     # Transform the output from the handler into the requested output format
     cherrypy.response.headers['Content-Type'] = best
+    if ret is unexpected_error:
+        return unexpected_error_out[best]
     out = cherrypy.response.processors[best]
     return out(ret)
 
@@ -438,7 +464,8 @@ def yaml_processor(entity):
     '''
     body = entity.fp.read()
     try:
-        cherrypy.serving.request.unserialized_data = yaml.safe_load(body)
+        cherrypy.serving.request.unserialized_data = yaml.load(
+                body, Loader=YamlLoader)
     except ValueError:
         raise cherrypy.HTTPError(400, 'Invalid YAML document')
 
@@ -464,6 +491,16 @@ def text_processor(entity):
     cherrypy.serving.request.raw_body = body
 
 
+# Be liberal in what you accept
+ct_in_map = {
+    'application/x-www-form-urlencoded': urlencoded_processor,
+    'application/json': json_processor,
+    'application/x-yaml': yaml_processor,
+    'text/yaml': yaml_processor,
+    'text/plain': text_processor,
+}
+
+
 def hypermedia_in():
     '''
     Unserialize POST/PUT data of a specified Content-Type.
@@ -474,24 +511,16 @@ def hypermedia_in():
     :raises HTTPError: if the request contains a Content-Type that we do not
         have a processor for
     '''
-    # Be liberal in what you accept
-    ct_in_map = {
-        'application/x-www-form-urlencoded': urlencoded_processor,
-        'application/json': json_processor,
-        'application/x-yaml': yaml_processor,
-        'text/yaml': yaml_processor,
-        'text/plain': text_processor,
-    }
-
     # Do not process the body for POST requests that have specified no content
     # or have not specified Content-Length
     if (cherrypy.request.method.upper() == 'POST'
             and cherrypy.request.headers.get('Content-Length', '0') == '0'):
         cherrypy.request.process_request_body = False
 
-    cherrypy.request.body.processors.clear()
     cherrypy.request.body.default_proc = cherrypy.HTTPError(
             406, 'Content type not supported')
+    # The processors are only looked up by CherryPy, never modified, so the
+    # module-level map is shared by all requests
     cherrypy.request.body.processors = ct_in_map
 
 
@@ -578,8 +607,7 @@ class LowDataAdapter(object):
         if not isinstance(lowstate, list):
             raise cherrypy.HTTPError(400, 'Lowstates must be a list')
 
-        # Make any requested additions or modifications to each lowstate, then
-        # execute each one and yield the result.
+        # Make any requested additions or modifications to each lowstate
         for chunk in lowstate:
             if token:
                 chunk['token'] = token
@@ -592,8 +620,14 @@ class LowDataAdapter(object):
             if 'arg' in chunk and not isinstance(chunk['arg'], list):
                 chunk['arg'] = [chunk['arg']]
 
-            ret = self.api.run(chunk)
+        # Execute the chunks, multiple chunks are run one after the other as a
+        # batch sharing the LocalClient, and yield the results in order
+        if len(lowstate) > 1:
+            rets = self.api.run_batch(lowstate)
+        else:
+            rets = [self.api.run(chunk) for chunk in lowstate]
 
+        for ret in rets:
             # Sometimes Salt gives us a return and sometimes an iterator
             if isinstance(ret, collections.Iterator):
                 for i in ret:
@@ -630,16 +664,9 @@ class LowDataAdapter(object):
             HTTP/1.1 200 OK
             Content-Type: application/json
         '''
-        import inspect
-
-        # Grab all available client interfaces
-        clients = [name for name, _ in inspect.getmembers(salt.netapi.NetapiClient,
-            predicate=inspect.ismethod) if not name.startswith('__')]
-        clients.remove('run')  # run method calls client interfaces
-
         return {
             'return': "Welcome",
-            'clients': clients,
+            'clients': list(salt.netapi.CLIENTS),
         }
 
     @cherrypy.tools.salt_token()
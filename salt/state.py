@@ -31,7 +31,7 @@ import salt.fileclient
 import salt.utils.event
 import salt.syspaths as syspaths
 from salt.utils import context, immutabletypes
-from salt._compat import string_types
+from salt._compat import string_types, integer_types
 from salt.template import compile_template, compile_template_str
 from salt.exceptions import SaltRenderError, SaltReqTimeoutError, SaltException
 from salt.utils.odict import OrderedDict, DefaultOrderedDict
@@ -73,6 +73,11 @@ STATE_INTERNAL_KEYWORDS = frozenset([
 ])
 
 
+# Chunk values of these types are never modified in place, chunks holding
+# only these can be copied without a deep copy
+_FLAT_TYPES = string_types + integer_types + (float, bool, type(None))
+
+
 def _odict_hashable(self):
     return id(self)
 
@@ -207,6 +212,17 @@ def master_compile(master_opts, minion_opts, grains, id_, saltenv):
     return st_.compile_highstate()
 
 
+def _copy_chunk(chunk):
+    '''
+    Copy a low chunk, only fall back to a deep copy if the chunk holds
+    mutable arguments which must not be shared between chunks
+    '''
+    for val in chunk.values():
+        if not isinstance(val, _FLAT_TYPES):
+            return copy.deepcopy(chunk)
+    return chunk.copy()
+
+
 def ishashable(obj):
     try:
         hash(obj)
@@ -493,9 +509,9 @@ class Compiler(object):
                 if names:
                     name_order = 1
                     for entry in names:
-                        live = copy.deepcopy(chunk)
+                        live = _copy_chunk(chunk)
                         if isinstance(entry, dict):
-                            low_name = entry.keys()[0]
+                            low_name = next(iter(entry))
                             live['name'] = low_name
                             live.update(entry[low_name][0])
                         else:
@@ -506,7 +522,7 @@ class Compiler(object):
                             live['fun'] = fun
                             chunks.append(live)
                 else:
-                    live = copy.deepcopy(chunk)
+                    live = _copy_chunk(chunk)
                     for fun in funcs:
                         live['fun'] = fun
                         chunks.append(live)
@@ -531,7 +547,7 @@ class Compiler(object):
                 # Explicitly declared exclude
                 if len(exc) != 1:
                     continue
-                key = exc.keys()[0]
+                key = next(iter(exc))
                 if key == 'sls':
                     ex_sls.add(exc['sls'])
                 elif key == 'id':
@@ -561,11 +577,16 @@ class State(object):
         self._pillar_override = pillar
         self.opts['pillar'] = self._gather_pillar()
         self.state_con = {}
+        # Created here as well as in load_modules, subclasses such as
+        # SSHState override load_modules without calling it
+        self._argspec_cache = {}
         self.load_modules()
         self.active = set()
         self.mod_init = set()
         self.pre = {}
         self.__run_num = 0
+        self.__chunk_index = (None, {})
+        self.__req_cache = {}
         self.jid = jid
 
     def _gather_pillar(self):
@@ -703,6 +724,7 @@ class State(object):
                                         )
                                 self.functions[f_key] = funcs[func]
         self.states = salt.loader.states(self.opts, self.functions)
+        self._argspec_cache = {}
         self.rend = salt.loader.render(self.opts, self.functions, states=self.states)
 
     def module_refresh(self):
@@ -766,6 +788,23 @@ class State(object):
                      'return: {0}'
                      ).format(','.join(bad)))
 
+    def _argspec(self, full):
+        '''
+        Return the argspec of the named state function along with the number
+        of arguments and the number of default values it takes. The results
+        are cached until the state modules are reloaded.
+        '''
+        if full not in self._argspec_cache:
+            aspec = salt.utils.get_function_argspec(self.states[full])
+            arglen = 0
+            deflen = 0
+            if isinstance(aspec.args, list):
+                arglen = len(aspec.args)
+            if isinstance(aspec.defaults, tuple):
+                deflen = len(aspec.defaults)
+            self._argspec_cache[full] = (aspec, arglen, deflen)
+        return self._argspec_cache[full]
+
     def verify_data(self, data):
         '''
         Verify the data, return an error statement if something is wrong
@@ -802,13 +841,7 @@ class State(object):
                         )
         else:
             # First verify that the parameters are met
-            aspec = salt.utils.get_function_argspec(self.states[full])
-            arglen = 0
-            deflen = 0
-            if isinstance(aspec.args, list):
-                arglen = len(aspec.args)
-            if isinstance(aspec.defaults, tuple):
-                deflen = len(aspec.defaults)
+            aspec, arglen, deflen = self._argspec(full)
             for ind in range(arglen - deflen):
                 if aspec.args[ind] not in data:
                     errors.append(
@@ -1086,9 +1119,9 @@ class State(object):
                 if names:
                     name_order = 1
                     for entry in names:
-                        live = copy.deepcopy(chunk)
+                        live = _copy_chunk(chunk)
                         if isinstance(entry, dict):
-                            low_name = entry.keys()[0]
+                            low_name = next(iter(entry))
                             live['name'] = low_name
                             live.update(entry[low_name][0])
                         else:
@@ -1099,7 +1132,7 @@ class State(object):
                             live['fun'] = fun
                             chunks.append(live)
                 else:
-                    live = copy.deepcopy(chunk)
+                    live = _copy_chunk(chunk)
                     for fun in funcs:
                         live['fun'] = fun
                         chunks.append(live)
@@ -1199,7 +1232,7 @@ class State(object):
                 # Explicitly declared exclude
                 if len(exc) != 1:
                     continue
-                key = exc.keys()[0]
+                key = next(iter(exc))
                 if key == 'sls':
                     ex_sls.add(exc['sls'])
                 elif key == 'id':
@@ -1368,12 +1401,11 @@ class State(object):
                                             continue
                                         if len(arg) != 1:
                                             continue
-                                        if next(iter(arg)) in ignore_args:
+                                        argfirst = next(iter(arg))
+                                        if argfirst in ignore_args:
                                             continue
                                         # Don't use name or names
-                                        if arg.keys()[0] == 'name':
-                                            continue
-                                        if arg.keys()[0] == 'names':
+                                        if argfirst in ('name', 'names'):
                                             continue
                                         extend[ext_id][_state].append(arg)
                                     continue
@@ -1394,12 +1426,11 @@ class State(object):
                                             continue
                                         if len(arg) != 1:
                                             continue
-                                        if next(iter(arg)) in ignore_args:
+                                        argfirst = next(iter(arg))
+                                        if argfirst in ignore_args:
                                             continue
                                         # Don't use name or names
-                                        if arg.keys()[0] == 'name':
-                                            continue
-                                        if arg.keys()[0] == 'names':
+                                        if argfirst in ('name', 'names'):
                                             continue
                                         extend[id_][state].append(arg)
                                     continue
@@ -1589,14 +1620,67 @@ class State(object):
             self.active = set()
         return running
 
+    def _chunk_index(self, chunks):
+        '''
+        Return an index of the passed chunks keyed on (state, name) and
+        (state, __id__), the index is rebuilt when a new chunk list is passed
+        '''
+        if self.__chunk_index[0] is not chunks:
+            index = {}
+            for chunk in chunks:
+                for key in (chunk['name'], chunk['__id__']):
+                    if not isinstance(key, string_types):
+                        continue
+                    bucket = index.setdefault(
+                            (chunk['state'], os.path.normcase(key)), [])
+                    # Don't add the chunk twice when the name is the ID
+                    if not bucket or bucket[-1] is not chunk:
+                        bucket.append(chunk)
+            self.__chunk_index = (chunks, index)
+            self.__req_cache = {}
+        return self.__chunk_index[1]
+
+    def _req_chunks(self, req_key, req_val, chunks):
+        '''
+        Return the chunks that the passed requisite refers to, in the order
+        they appear in the chunk list
+        '''
+        if req_val is None:
+            return []
+        index = self._chunk_index(chunks)
+        if (req_key != 'sls'
+                and isinstance(req_val, string_types)
+                and not any(char in req_val for char in '*?[')):
+            # Not a glob, the matching chunks can be looked up directly
+            return index.get((req_key, os.path.normcase(req_val)), [])
+        # Globs and sls requisites need a full scan, remember the result so
+        # that re-checking the requisites of a chunk does not scan again
+        cache_key = (req_key, req_val)
+        if ishashable(req_val) and cache_key in self.__req_cache:
+            return self.__req_cache[cache_key]
+        found = []
+        for chunk in chunks:
+            if (fnmatch.fnmatch(chunk['name'], req_val) or
+                fnmatch.fnmatch(chunk['__id__'], req_val)):
+                if chunk['state'] == req_key:
+                    found.append(chunk)
+            elif req_key == 'sls':
+                # Allow requisite tracking of entire sls files
+                if fnmatch.fnmatch(chunk['__sls__'], req_val):
+                    found.append(chunk)
+        if ishashable(req_val):
+            self.__req_cache[cache_key] = found
+        return found
+
     def check_failhard(self, low, running):
         '''
         Check if the low data chunk should send a failhard signal
         '''
-        tag = _gen_tag(low)
-        if (low.get('failhard', False) or self.opts['failhard']
-                and tag in running):
-            return not running[tag]['result']
+        if low.get('failhard', False) or self.opts['failhard']:
+            # Only build the tag when failhard is actually in play
+            tag = _gen_tag(low)
+            if tag in running:
+                return not running[tag]['result']
         return False
 
     def check_requisite(self, low, running, chunks, pre=False):
@@ -1638,66 +1722,51 @@ class State(object):
             if r_state in low and low[r_state] is not None:
                 for req in low[r_state]:
                     req = trim_req(req)
-                    found = False
-                    for chunk in chunks:
-                        req_key = next(iter(req))
-                        req_val = req[req_key]
-                        if req_val is None:
-                            continue
-                        if (fnmatch.fnmatch(chunk['name'], req_val) or
-                            fnmatch.fnmatch(chunk['__id__'], req_val)):
-                            if chunk['state'] == req_key:
-                                found = True
-                                reqs[r_state].append(chunk)
-                        elif req_key == 'sls':
-                            # Allow requisite tracking of entire sls files
-                            if fnmatch.fnmatch(chunk['__sls__'], req_val):
-                                found = True
-                                reqs[r_state].append(chunk)
+                    req_key = next(iter(req))
+                    found = self._req_chunks(req_key, req[req_key], chunks)
                     if not found:
                         return 'unmet'
-        fun_stats = set()
-        for r_state, chunks in reqs.items():
+                    reqs[r_state].extend(found)
+        # Only an unmet requisite can end the scan early, the remaining
+        # outcomes rank fail > pre > change > met
+        fail = pre_ = premet = change = False
+        for r_state, r_chunks in reqs.items():
             if r_state == 'prereq':
                 run_dict = self.pre
             else:
                 run_dict = running
-            for chunk in chunks:
+            for chunk in r_chunks:
                 tag = _gen_tag(chunk)
                 if tag not in run_dict:
-                    fun_stats.add('unmet')
-                    continue
+                    return 'unmet'
+                r_ret = run_dict[tag]
                 if r_state == 'onfail':
-                    if run_dict[tag]['result'] is True:
-                        fun_stats.add('fail')
-                        continue
-                else:
-                    if run_dict[tag]['result'] is False:
-                        fun_stats.add('fail')
+                    if r_ret['result'] is True:
+                        fail = True
                         continue
+                elif r_ret['result'] is False:
+                    fail = True
+                    continue
                 if r_state == 'onchanges':
-                    if not run_dict[tag]['changes']:
-                        fun_stats.add('fail')
+                    if not r_ret['changes']:
+                        fail = True
                         continue
-                if r_state == 'watch' and run_dict[tag]['changes']:
-                    fun_stats.add('change')
-                    continue
-                if r_state == 'prereq' and run_dict[tag]['result'] is None:
-                    fun_stats.add('premet')
-                if r_state == 'prereq' and not run_dict[tag]['result'] is None:
-                    fun_stats.add('pre')
-                else:
-                    fun_stats.add('met')
+                elif r_state == 'watch':
+                    if r_ret['changes']:
+                        change = True
+                elif r_state == 'prereq':
+                    if r_ret['result'] is None:
+                        premet = True
+                    else:
+                        pre_ = True
 
-        if 'unmet' in fun_stats:
-            return 'unmet'
-        elif 'fail' in fun_stats:
+        if fail:
             return 'fail'
-        elif 'pre' in fun_stats:
-            if 'premet' in fun_stats:
+        elif pre_:
+            if premet:
                 return 'met'
             return 'pre'
-        elif 'change' in fun_stats:
+        elif change:
             return 'change'
         return 'met'
 
@@ -1739,30 +1808,17 @@ class State(object):
                     continue
                 for req in low[requisite]:
                     req = trim_req(req)
-                    found = False
-                    for chunk in chunks:
-                        req_key = next(iter(req))
-                        req_val = req[req_key]
-                        if req_val is None:
-                            continue
-                        if (fnmatch.fnmatch(chunk['name'], req_val) or
-                            fnmatch.fnmatch(chunk['__id__'], req_val)):
-                            if chunk['state'] == req_key:
-                                if requisite == 'prereq':
-                                    chunk['__prereq__'] = True
-                                elif requisite == 'prerequired':
-                                    chunk['__prerequired__'] = True
-                                reqs.append(chunk)
-                                found = True
-                        elif req_key == 'sls':
-                            # Allow requisite tracking of entire sls files
-                            if fnmatch.fnmatch(chunk['__sls__'], req_val):
-                                if requisite == 'prereq':
-                                    chunk['__prereq__'] = True
-                                reqs.append(chunk)
-                                found = True
+                    req_key = next(iter(req))
+                    found = self._req_chunks(req_key, req[req_key], chunks)
                     if not found:
                         lost[requisite].append(req)
+                        continue
+                    for chunk in found:
+                        if requisite == 'prereq':
+                            chunk['__prereq__'] = True
+                        elif requisite == 'prerequired' and req_key != 'sls':
+                            chunk['__prerequired__'] = True
+                    reqs.extend(found)
             if lost['require'] or lost['watch'] or lost['prereq'] or lost['onfail'] or lost['onchanges'] or lost.get('prerequired'):
                 comment = 'The following requisites were not found:\n'
                 for requisite, lreqs in lost.items():
@@ -2293,7 +2349,7 @@ class BaseHighState(object):
         Returns:
         {'saltenv': ['state1', 'state2', ...]}
         '''
-        matches = {}
+        matches = DefaultOrderedDict(list)
         # pylint: disable=cell-var-from-loop
         for saltenv, body in top.items():
             if self.opts['environment']:
@@ -2308,15 +2364,14 @@ class BaseHighState(object):
                             _data,
                             _opts
                             ):
-                        if saltenv not in matches:
-                            matches[saltenv] = []
+                        env_matches = matches[saltenv]
                         for item in _data:
                             if 'subfilter' in item:
                                 _tmpdata = item.pop('subfilter')
                                 for match, data in _tmpdata.items():
                                     _filter_matches(match, data, _opts)
                             if isinstance(item, string_types):
-                                matches[saltenv].append(item)
+                                env_matches.append(item)
                 _filter_matches(match, data, self.opts['nodegroups'])
         ext_matches = self.client.ext_nodes()
         for saltenv in ext_matches:
@@ -2326,7 +2381,9 @@ class BaseHighState(object):
             else:
                 matches[saltenv] = ext_matches[saltenv]
         # pylint: enable=cell-var-from-loop
-        return matches
+        # Hand back a plain OrderedDict, outputters and serializers only
+        # know the exact type
+        return OrderedDict(matches)
 
     def load_dynamic(self, matches):
         '''
@@ -2515,7 +2572,7 @@ class BaseHighState(object):
                     for arg in state[name][s_dec]:
                         if isinstance(arg, dict):
                             if len(arg) > 0:
-                                if arg.keys()[0] == 'order':
+                                if next(iter(arg)) == 'order':
                                     found = True
                     if not found:
                         if not isinstance(state[name][s_dec], list):
@@ -2916,6 +2973,7 @@ class MasterState(State):
         # Load the states, but they should not be used in this class apart
         # from inspection
         self.states = salt.loader.states(self.opts, self.functions)
+        self._argspec_cache = {}
         self.rend = salt.loader.render(self.opts, self.functions, states=self.states)
 
 
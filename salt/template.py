@@ -103,10 +103,16 @@ def compile_template_str(template, renderers, default):
     Take template as a string and return the high data structure
     derived from the template.
     '''
+    # The renderers work on files (tmplpath is needed for relative includes
+    # and by the py renderers), so the string has to be written out, make
+    # sure the temp file does not outlive the render
     fn_ = salt.utils.mkstemp()
-    with salt.utils.fopen(fn_, 'wb') as ofile:
-        ofile.write(SLS_ENCODER(template)[0])
-    return compile_template(fn_, renderers, default)
+    try:
+        with salt.utils.fopen(fn_, 'wb') as ofile:
+            ofile.write(SLS_ENCODER(template)[0])
+        return compile_template(fn_, renderers, default)
+    finally:
+        salt.utils.safe_rm(fn_)
 
 
 def template_shebang(template, renderers, default):
@@ -7,6 +7,7 @@ from __future__ import absolute_import
 
 # Import python libs
 import codecs
+import hashlib
 import os
 import imp
 import logging
@@ -39,6 +40,48 @@ TEMPLATE_DIRNAME = os.path.join(saltpath[0], 'templates')
 SLS_ENCODING = 'utf-8'  # this one has no BOM.
 SLS_ENCODER = codecs.getencoder(SLS_ENCODING)
 
+# Jinja bytecode caches, keyed by cache directory
+JINJA_BYTECODE_CACHES = {}
+
+
+def _jinja_bytecode_cache(cachedir, env_args):
+    '''
+    Return the Jinja bytecode cache for templates compiled with the passed
+    environment arguments, or None if the cache directory is not usable
+
+    Jinja only checks the template source before reusing cached bytecode, so
+    every combination of the settings that change the compiled code gets its
+    own directory.
+    '''
+    settings = (
+        bool(env_args.get('trim_blocks')),
+        bool(env_args.get('lstrip_blocks')),
+        tuple(
+            ext if isinstance(ext, string_types)
+            else '{0}.{1}'.format(ext.__module__, ext.__name__)
+            for ext in env_args.get('extensions', [])
+        )
+    )
+    bcc_dir = os.path.join(
+        cachedir,
+        'jinja_cache',
+        hashlib.md5(repr(settings).encode('utf-8')).hexdigest()
+    )
+    if bcc_dir not in JINJA_BYTECODE_CACHES:
+        if not os.path.isdir(bcc_dir):
+            try:
+                os.makedirs(bcc_dir)
+            except OSError as exc:
+                log.warning(
+                    'Unable to create the Jinja bytecode cache directory '
+                    '{0}: {1}'.format(bcc_dir, exc)
+                )
+                return None
+        JINJA_BYTECODE_CACHES[bcc_dir] = jinja2.FileSystemBytecodeCache(
+            bcc_dir
+        )
+    return JINJA_BYTECODE_CACHES[bcc_dir]
+
 
 def wrap_tmpl_func(render_str):
 
@@ -256,6 +299,16 @@ def render_jinja_tmpl(tmplstr, context, tmplpath=None):
         log.debug('Jinja2 lstrip_blocks is enabled')
         env_args['lstrip_blocks'] = True
 
+    # Templates pulled in through the loader (includes, imports) can have
+    # their compiled bytecode cached, the cache is invalidated by Jinja when
+    # the template source changes
+    if (loader is not None
+            and opts.get('jinja_bytecode_cache', False)
+            and opts.get('cachedir')):
+        bcc = _jinja_bytecode_cache(opts['cachedir'], env_args)
+        if bcc is not None:
+            env_args['bytecode_cache'] = bcc
+
     if opts.get('allow_undefined', False):
         jinja_env = jinja2.Environment(**env_args)
     else:
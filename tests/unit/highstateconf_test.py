@@ -9,7 +9,8 @@ ensure_in_syspath('../../')
 
 # Import Salt libs
 import salt.config
-from salt.state import HighState
+from salt.state import HighState, State
+from salt.utils.odict import OrderedDict
 
 
 OPTS = salt.config.minion_config(None)
@@ -38,6 +39,12 @@ class HighStateTestCase(TestCase):
         matches = self.highstate.top_matches(top)
         self.assertEqual(matches, {'env': ['state1']})
 
+    def test_top_matches_returns_ordereddict(self):
+        top = {'env': {'match': ['state1']}}
+        matches = self.highstate.top_matches(top)
+        self.assertIs(type(matches), OrderedDict)
+        self.assertRaises(KeyError, matches.__getitem__, 'other')
+
     def test_matches_whitelist(self):
         matches = {'env': ['state1', 'state2', 'state3']}
         matches = self.highstate.matches_whitelist(matches, ['state2'])
@@ -49,6 +56,24 @@ class HighStateTestCase(TestCase):
                                                    'state2,state3')
         self.assertEqual(matches, {'env': ['state2', 'state3']})
 
+    def test_verify_data_subclass_load_modules(self):
+        loaded = self.highstate.state
+
+        class WrappedState(State):
+            # Mirrors SSHState, which does not call State.load_modules
+            def load_modules(self, data=None):
+                self.functions = loaded.functions
+                self.states = loaded.states
+                self.rend = loaded.rend
+
+        state = WrappedState(OPTS)
+        low = {'state': 'test',
+               'fun': 'succeed_without_changes',
+               'name': 'foo',
+               '__id__': 'foo',
+               '__sls__': 'foo'}
+        self.assertEqual(state.verify_data(low), [])
+
 
 if __name__ == '__main__':
     from integration import run_tests
@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+
+# Import Salt Testing Libs
+from salttesting import TestCase, skipIf
+from salttesting.mock import MagicMock, patch, NO_MOCK, NO_MOCK_REASON
+from salttesting.helpers import ensure_in_syspath
+ensure_in_syspath('../../')
+
+# Import salt libs
+import salt.netapi
+from salt.exceptions import SaltException
+
+
+@skipIf(NO_MOCK, NO_MOCK_REASON)
+class NetapiClientTestCase(TestCase):
+    '''
+    Test cases for salt.netapi.NetapiClient
+    '''
+    def setUp(self):
+        self.calls = []
+        self.local = MagicMock()
+        self.local.cmd.side_effect = self._cmd
+        self.local.cmd_batch.side_effect = self._cmd_batch
+
+    def _cmd(self, *args, **kwargs):
+        self.calls.append('cmd')
+        return {'minion': True}
+
+    def _cmd_batch(self, *args, **kwargs):
+        def _batches():
+            for num in range(2):
+                self.calls.append('batch')
+                yield {'minion{0}'.format(num): True}
+        return _batches()
+
+    def test_run_batch_order(self):
+        '''
+        Each chunk is run and its result drained before the next chunk starts
+        '''
+        lows = [{'client': 'local_batch', 'token': 'x', 'tgt': '*',
+                 'fun': 'test.ping'},
+                {'client': 'local', 'token': 'x', 'tgt': '*',
+                 'fun': 'test.ping'}]
+        with patch('salt.client.get_local_client',
+                   MagicMock(return_value=self.local)):
+            client = salt.netapi.NetapiClient({})
+            rets = client.run_batch(lows)
+            batch_ret = next(rets)
+            self.assertEqual(self.calls, ['batch', 'batch'])
+            self.assertEqual(list(batch_ret),
+                             [{'minion0': True}, {'minion1': True}])
+            self.assertEqual(list(rets), [{'minion': True}])
+        self.assertEqual(self.calls, ['batch', 'batch', 'cmd'])
+
+    def test_run_batch_shares_local_client(self):
+        '''
+        The chunks of a batch share a single LocalClient
+        '''
+        lows = [{'client': 'local', 'token': 'x', 'tgt': '*',
+                 'fun': 'test.ping'}] * 3
+        get_local_client = MagicMock(return_value=self.local)
+        with patch('salt.client.get_local_client', get_local_client):
+            client = salt.netapi.NetapiClient({})
+            self.assertEqual(list(client.run_batch(lows)),
+                             [{'minion': True}] * 3)
+            self.assertEqual(get_local_client.call_count, 1)
+            # The shared client only lives for the batch
+            list(client.run_batch(lows))
+            self.assertEqual(get_local_client.call_count, 2)
+
+    def test_run_rejects_non_client_methods(self):
+        '''
+        Only the public client interfaces can be selected by a lowstate
+        '''
+        self.assertIn('local', salt.netapi.CLIENTS)
+        client = salt.netapi.NetapiClient({})
+        for name in ('_local_client', '__init__', 'run', 'run_batch'):
+            self.assertNotIn(name, salt.netapi.CLIENTS)
+            low = {'client': name, 'token': 'x', 'lows': [], 'low': {}}
+            self.assertRaises(SaltException, client.run, low)
+
+
+if __name__ == '__main__':
+    from integration import run_tests
+    run_tests(NetapiClientTestCase, needs_daemon=False)
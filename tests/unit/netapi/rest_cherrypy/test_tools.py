@@ -34,6 +34,94 @@ class TestOutFormats(BaseToolsTest):
         ))
         self.assertEqual(response.headers['Content-type'], 'application/x-yaml')
 
+    def test_weighted_accept(self):
+        request, response = self.request('/', headers=(
+            ('Accept', 'application/json;q=0.5, application/x-yaml'),
+        ))
+        self.assertEqual(response.headers['Content-type'], 'application/x-yaml')
+
+    def test_serializers_output(self):
+        '''
+        The serialized output is the same as the stdlib json module and the
+        PyYAML safe dumper produce
+        '''
+        from salt.netapi.rest_cherrypy import app
+        data = {'return': [{
+            'minion': {
+                'retcode': 0,
+                'stdout': u'h\xe9llo\nworld',
+                'ratio': 0.5,
+                'result': True,
+                'comment': None,
+                'pkgs': ['vim', 'git'],
+            },
+        }]}
+        self.assertEqual(
+            app.ct_out_processors['application/json'](data),
+            json.dumps(data))
+        self.assertEqual(
+            app.ct_out_processors['application/x-yaml'](data),
+            yaml.safe_dump(data, default_flow_style=False))
+
+
+
+class TestUnexpectedError(BaseToolsTest):
+    '''
+    Exceptions raised by a handler are returned as a 500 in the requested
+    format
+    '''
+    _cp_config = {}
+
+    def setUp(self):
+        super(TestUnexpectedError, self).setUp()
+        import cherrypy
+        from salt.netapi.rest_cherrypy import app
+        self.cherrypy = cherrypy
+        self.app = app
+        self._debug = cherrypy.config.get('debug', False)
+
+        host = cherrypy.lib.httputil.Host('127.0.0.1', 50000, '')
+        self.request = cherrypy._cprequest.Request(host, host)
+        self.request.headers = cherrypy.lib.httputil.HeaderMap()
+        self.request._hypermedia_inner_handler = self._raise
+        self.response = cherrypy._cprequest.Response()
+        cherrypy.serving.load(self.request, self.response)
+
+    def tearDown(self):
+        self.cherrypy.serving.clear()
+        self.cherrypy.config['debug'] = self._debug
+        super(TestUnexpectedError, self).tearDown()
+
+    def _raise(self, *args, **kwargs):
+        raise ValueError('Something broke')
+
+    def _handle(self, accept, debug=False):
+        self.cherrypy.config['debug'] = debug
+        self.request.headers['Accept'] = accept
+        body = self.app.hypermedia_handler()
+        self.assertEqual(self.response.status, 500)
+        self.assertEqual(self.response.headers['Content-Type'], accept)
+        return body
+
+    def test_json(self):
+        body = self._handle('application/json')
+        self.assertEqual(json.loads(body), {
+            'status': 500,
+            'return': 'An unexpected error occurred',
+        })
+
+    def test_yaml(self):
+        body = self._handle('application/x-yaml')
+        self.assertEqual(yaml.safe_load(body), {
+            'status': 500,
+            'return': 'An unexpected error occurred',
+        })
+
+    def test_debug(self):
+        ret = json.loads(self._handle('application/json', debug=True))
+        self.assertEqual(ret['status'], 500)
+        self.assertIn('Traceback', ret['return'])
+        self.assertIn('Something broke', ret['return'])
 
 class TestInFormats(BaseToolsTest):
     _cp_config = {
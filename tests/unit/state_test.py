@@ -0,0 +1,218 @@
+# -*- coding: utf-8 -*-
+
+# Import python libs
+import fnmatch
+
+# Import Salt Testing libs
+from salttesting import TestCase
+from salttesting.helpers import ensure_in_syspath
+
+ensure_in_syspath('../')
+ensure_in_syspath('../../')
+
+# Import Salt libs
+import salt.config
+import salt.loader
+from salt.state import State, _gen_tag
+
+
+OPTS = salt.config.minion_config(None)
+OPTS['id'] = 'match'
+OPTS['file_client'] = 'local'
+OPTS['file_roots'] = dict(base=['/tmp'])
+OPTS['test'] = False
+OPTS['grains'] = salt.loader.grains(OPTS)
+
+
+def _chunk(state, name, id_, sls, fun='run'):
+    return {'state': state,
+            'name': name,
+            '__id__': id_,
+            '__sls__': sls,
+            'fun': fun}
+
+
+def _scan(req_key, req_val, chunks):
+    '''
+    The full scan State used to resolve a requisite before the chunk index
+    '''
+    found = []
+    if req_val is None:
+        return found
+    for chunk in chunks:
+        if (fnmatch.fnmatch(chunk['name'], req_val) or
+                fnmatch.fnmatch(chunk['__id__'], req_val)):
+            if chunk['state'] == req_key:
+                found.append(chunk)
+        elif req_key == 'sls':
+            if fnmatch.fnmatch(chunk['__sls__'], req_val):
+                found.append(chunk)
+    return found
+
+
+class ReqChunksTestCase(TestCase):
+    def setUp(self):
+        self.state = State(OPTS)
+        self.chunks = [
+            _chunk('file', '/etc/foo', 'foo_conf', 'base.files'),
+            _chunk('file', '/etc/foo.d/bar', '/etc/foo.d/bar', 'base.files'),
+            _chunk('cmd', 'echo hi', 'hello', 'base.cmds'),
+            _chunk('cmd', 'echo hi', 'hello_again', 'base.cmds'),
+            # The name matches the sls pattern below, the scan never falls
+            # through to the sls check for it
+            _chunk('service', 'base.files', 'svc', 'base.files'),
+            _chunk('service', 'nginx', 'web', 'base.web'),
+        ]
+
+    def _check(self, req_key, req_val, expected, chunks=None):
+        if chunks is None:
+            chunks = self.chunks
+        found = self.state._req_chunks(req_key, req_val, chunks)
+        self.assertEqual(found, _scan(req_key, req_val, chunks))
+        self.assertEqual([id(chunk) for chunk in found],
+                         [id(chunk) for chunk in expected])
+
+    def test_name(self):
+        self._check('file', '/etc/foo', [self.chunks[0]])
+        self._check('service', 'nginx', [self.chunks[5]])
+
+    def test_id(self):
+        self._check('file', 'foo_conf', [self.chunks[0]])
+        self._check('service', 'web', [self.chunks[5]])
+
+    def test_wrong_state(self):
+        self._check('cmd', '/etc/foo', [])
+
+    def test_name_is_id(self):
+        self._check('file', '/etc/foo.d/bar', [self.chunks[1]])
+
+    def test_shared_name(self):
+        self._check('cmd', 'echo hi', [self.chunks[2], self.chunks[3]])
+
+    def test_glob(self):
+        self._check('file', '/etc/foo*', [self.chunks[0], self.chunks[1]])
+        self._check('cmd', 'hell?', [self.chunks[2]])
+        self._check('cmd', 'hello*', [self.chunks[2], self.chunks[3]])
+        self._check('file', '/etc/[f]oo', [self.chunks[0]])
+
+    def test_sls(self):
+        self._check('sls', 'base.cmds', [self.chunks[2], self.chunks[3]])
+        self._check('sls', 'base.*',
+                    [self.chunks[0], self.chunks[1], self.chunks[2],
+                     self.chunks[3], self.chunks[5]])
+        self._check('sls', 'base.files', [self.chunks[0], self.chunks[1]])
+
+    def test_none(self):
+        self._check('file', None, [])
+        self._check('sls', None, [])
+
+    def test_new_chunk_list(self):
+        self._check('cmd', 'echo hi', [self.chunks[2], self.chunks[3]])
+        chunks = [_chunk('cmd', 'echo hi', 'other', 'base.cmds')]
+        self._check('cmd', 'echo hi', [chunks[0]], chunks)
+        self._check('file', '/etc/foo', [], chunks)
+
+    def test_glob_cache_new_chunk_list(self):
+        self._check('cmd', 'hello*', [self.chunks[2], self.chunks[3]])
+        self._check('sls', 'base.cmds', [self.chunks[2], self.chunks[3]])
+        # A new list holding the same chunks and more, like the mod_watchers
+        # list built by call_listen, must not be served the memoized scan
+        extra = _chunk('cmd', 'echo bye', 'hello_later', 'base.cmds')
+        chunks = self.chunks + [extra]
+        self._check('cmd', 'hello*',
+                    [self.chunks[2], self.chunks[3], extra], chunks)
+        self._check('sls', 'base.cmds',
+                    [self.chunks[2], self.chunks[3], extra], chunks)
+        # Changing the chunk list again drops the memo once more
+        self._check('cmd', 'hello*', [self.chunks[2], self.chunks[3]])
+
+
+
+CHANGED = {'diff': 'changed'}
+
+# (requisites, running results, State.pre results, expected status), results
+# are (result, changes) keyed on the name of the required test state
+CHECK_REQUISITE_CASES = (
+    # require
+    ({'require': ['a']}, {}, {}, 'unmet'),
+    ({'require': ['nope']}, {'a': (True, {})}, {}, 'unmet'),
+    ({'require': ['a']}, {'a': (True, {})}, {}, 'met'),
+    ({'require': ['a']}, {'a': (None, {})}, {}, 'met'),
+    ({'require': ['a']}, {'a': (False, {})}, {}, 'fail'),
+    # watch
+    ({'watch': ['a']}, {'a': (True, CHANGED)}, {}, 'change'),
+    ({'watch': ['a']}, {'a': (True, {})}, {}, 'met'),
+    ({'watch': ['a']}, {'a': (False, CHANGED)}, {}, 'fail'),
+    # prereq, looked up in State.pre
+    ({'prereq': ['a']}, {'a': (True, {})}, {}, 'unmet'),
+    ({'prereq': ['a']}, {}, {'a': (None, CHANGED)}, 'met'),
+    ({'prereq': ['a']}, {}, {'a': (True, {})}, 'pre'),
+    ({'prereq': ['a']}, {}, {'a': (False, {})}, 'fail'),
+    ({'prereq': ['a', 'b']}, {}, {'a': (True, {}), 'b': (None, {})}, 'met'),
+    # onfail turns the meaning of the result around
+    ({'onfail': ['a']}, {'a': (False, {})}, {}, 'met'),
+    ({'onfail': ['a']}, {'a': (None, {})}, {}, 'met'),
+    ({'onfail': ['a']}, {'a': (True, {})}, {}, 'fail'),
+    # onchanges fails without changes
+    ({'onchanges': ['a']}, {'a': (True, CHANGED)}, {}, 'met'),
+    ({'onchanges': ['a']}, {'a': (True, {})}, {}, 'fail'),
+    ({'onchanges': ['a']}, {'a': (False, CHANGED)}, {}, 'fail'),
+    # ranking, unmet > fail > pre > change > met
+    ({'require': ['a', 'b']}, {'a': (False, {})}, {}, 'unmet'),
+    ({'require': ['a'], 'watch': ['b']},
+     {'a': (False, {}), 'b': (True, CHANGED)}, {}, 'fail'),
+    ({'prereq': ['a'], 'onfail': ['b']},
+     {'b': (True, {})}, {'a': (True, {})}, 'fail'),
+    ({'prereq': ['a'], 'watch': ['b']},
+     {'b': (True, CHANGED)}, {'a': (True, {})}, 'pre'),
+    ({'require': ['a'], 'watch': ['b']},
+     {'a': (True, {}), 'b': (True, CHANGED)}, {}, 'change'),
+    ({'require': ['a'], 'onchanges': ['b']},
+     {'a': (True, {}), 'b': (True, CHANGED)}, {}, 'met'),
+)
+
+
+class CheckRequisiteTestCase(TestCase):
+    def setUp(self):
+        self.state = State(OPTS)
+        self.chunks = [
+            _chunk('test', name, name, 'reqs', 'succeed_without_changes')
+            for name in ('a', 'b')
+        ]
+
+    def _results(self, results):
+        ret = {}
+        for chunk in self.chunks:
+            if chunk['name'] in results:
+                result, changes = results[chunk['name']]
+                ret[_gen_tag(chunk)] = {'result': result,
+                                        'changes': changes}
+        return ret
+
+    def _check(self, low, reqs, running, pre, expected):
+        for requisite, names in reqs.items():
+            low[requisite] = [{'test': name} for name in names]
+        self.state.pre = self._results(pre)
+        status = self.state.check_requisite(
+            low, self._results(running), self.chunks)
+        self.assertEqual(
+            status, expected,
+            '{0} with running {1} and pre {2} returned {3!r}, expected '
+            '{4!r}'.format(reqs, running, pre, status, expected))
+
+    def test_check_requisite(self):
+        for reqs, running, pre, expected in CHECK_REQUISITE_CASES:
+            # cmd provides mod_watch, so watch requisites are kept
+            low = _chunk('cmd', 'low', 'low', 'low')
+            self._check(low, reqs, running, pre, expected)
+
+    def test_watch_without_mod_watch(self):
+        # The test states have no mod_watch, the watch becomes a require
+        low = _chunk('test', 'low', 'low', 'low', 'succeed_without_changes')
+        self._check(low, {'watch': ['a']}, {'a': (True, CHANGED)}, {}, 'met')
+        self.assertNotIn('watch', low)
+
+
+if __name__ == '__main__':
+    from integration import run_tests
+    run_tests(ReqChunksTestCase, CheckRequisiteTestCase, needs_daemon=False)
@@ -3,6 +3,9 @@
     :codeauthor: :email: `Mike Place <mp@saltstack.com>`
 '''
 
+# Import python libs
+import os
+
 # Import Salt Testing libs
 from salttesting import TestCase
 from salttesting.helpers import ensure_in_syspath
@@ -35,6 +38,22 @@ class TemplateTestCase(TestCase):
         self.assertIn(('fake_json_func', ''), ret)
         self.assertNotIn(('OBVIOUSLY_NOT_HERE', ''), ret)
 
+    def test_compile_template_str_removes_tmpfile(self):
+        '''
+        Test that the temporary file used to render a template string is
+        removed once the template has been rendered
+        '''
+        paths = []
+
+        def _render(data, saltenv, sls, tmplpath=None, **kwargs):
+            paths.append(tmplpath)
+            return {'rendered': data.read()}
+
+        ret = template.compile_template_str('foo', {'fake': _render}, 'fake')
+        self.assertDictEqual(ret, {'rendered': 'foo'})
+        self.assertEqual(len(paths), 1)
+        self.assertFalse(os.path.exists(paths[0]))
+
 if __name__ == '__main__':
     from integration import run_tests
     run_tests(TemplateTestCase, needs_daemon=False)
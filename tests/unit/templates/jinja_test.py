@@ -157,6 +157,55 @@ class TestGetTemplate(TestCase):
                 dict(opts=self.local_opts, saltenv='other'))
         self.assertEqual(out, 'Hey world !a b !\n')
 
+    def test_bytecode_cache(self):
+        '''
+        Templates imported through the loader get their bytecode cached in
+        the cachedir when jinja_bytecode_cache is enabled
+        '''
+        tmp = tempfile.mkdtemp()
+        opts = dict(self.local_opts, cachedir=tmp, jinja_bytecode_cache=True)
+        filename = os.path.join(TEMPLATES_DIR, 'files', 'test', 'hello_import')
+        with salt.utils.fopen(filename) as fp_:
+            tmplstr = fp_.read()
+        try:
+            for _ in range(2):
+                out = render_jinja_tmpl(
+                        tmplstr,
+                        dict(opts=opts, saltenv='other'))
+                self.assertEqual(out, 'Hey world !a b !\n')
+            self.assertTrue(os.listdir(os.path.join(tmp, 'jinja_cache')))
+        finally:
+            salt.utils.rm_rf(tmp)
+
+    def test_bytecode_cache_trim_blocks(self):
+        '''
+        Toggling jinja_trim_blocks must not reuse bytecode compiled with the
+        previous setting
+        '''
+        tmp = tempfile.mkdtemp()
+        roots = os.path.join(tmp, 'roots')
+        os.makedirs(roots)
+        with salt.utils.fopen(os.path.join(roots, 'block'), 'w') as fp_:
+            fp_.write('{% if True %}\nfoo\n{% endif %}\nbar\n')
+        tmplstr = '{% include "block" %}\n'
+        try:
+            for trim in (False, True, False):
+                opts = {'cachedir': os.path.join(tmp, 'cache'),
+                        'file_client': 'local',
+                        'file_roots': {'other': [roots]},
+                        'jinja_trim_blocks': trim}
+                expected = render_jinja_tmpl(
+                        tmplstr,
+                        dict(opts=opts, saltenv='other'))
+                out = render_jinja_tmpl(
+                        tmplstr,
+                        dict(opts=dict(opts, jinja_bytecode_cache=True),
+                             saltenv='other'))
+                self.assertEqual(out, expected)
+                self.assertEqual('\nfoo' in out, not trim)
+        finally:
+            salt.utils.rm_rf(tmp)
+
     def test_saltenv(self):
         '''
         If the template is within the searchpath it can